@@ -0,0 +1,47 @@
+"""Hatch build hook that compiles the converter module with Cython."""
+
+from pathlib import Path
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+# Modules compiled to C extensions. The extension is shipped next to the pure
+# Python source it was built from and takes precedence over it on import.
+CYTHON_MODULES = ["src/markdown_notion/converter.py"]
+
+
+class CythonBuildHook(BuildHookInterface):
+    """Compile the hot-path modules to C extensions when building a wheel."""
+
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version: str, build_data: dict) -> None:
+        if self.target_name != "wheel":
+            return
+
+        from Cython.Build import cythonize
+        from setuptools import Distribution
+        from setuptools.command.build_ext import build_ext
+
+        build_dir = Path(self.root) / "build"
+        distribution = Distribution(
+            {
+                "ext_modules": cythonize(
+                    CYTHON_MODULES,
+                    language_level=3,
+                    build_dir=str(build_dir / "cython"),
+                ),
+                "package_dir": {"": "src"},
+            }
+        )
+        command = build_ext(distribution)
+        command.build_lib = str(build_dir / "lib")
+        command.build_temp = str(build_dir / "temp")
+        command.ensure_finalized()
+        command.run()
+
+        build_data["pure_python"] = False
+        build_data["infer_tag"] = True
+        for extension in command.extensions:
+            output = Path(command.get_ext_fullpath(extension.name))
+            package = extension.name.rpartition(".")[0].replace(".", "/")
+            build_data["force_include"][str(output)] = f"{package}/{output.name}"
@@ -1,15 +1,22 @@
 """Package for converting markdown files to Notion pages."""
 
-from markdown_notion.converter import markdown_to_notion_blocks
+from markdown_notion.converter import iter_notion_blocks, markdown_to_notion_blocks
 from markdown_notion.converter_api import MarkdownToNotion
 from markdown_notion.notion import NotionClient
-from markdown_notion.parser import parse_markdown_file
+from markdown_notion.parser import (
+    iter_markdown_file,
+    parse_markdown_file,
+    parse_markdown_stream,
+)
 
 __version__ = "0.1.0"
 
 __all__ = [
     "MarkdownToNotion",
     "NotionClient",
+    "iter_markdown_file",
+    "iter_notion_blocks",
     "markdown_to_notion_blocks",
     "parse_markdown_file",
+    "parse_markdown_stream",
 ]
@@ -0,0 +1,70 @@
+"""Module for caching converted Notion blocks on disk."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+# Bump whenever parser or converter output changes, so stale entries are ignored
+CACHE_VERSION = 8
+
+
+def get_cache_dir() -> Path:
+    """Return the directory holding cached conversions."""
+    cache_home = os.getenv("XDG_CACHE_HOME")
+    base = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return base / "markdown_notion"
+
+
+def _cache_file(source: bytes) -> Path:
+    """Return the cache file for the given markdown source."""
+    digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+    return get_cache_dir() / f"v{CACHE_VERSION}-{digest}.json"
+
+
+def load_cached_blocks(source: bytes) -> Optional[List[Dict[str, Any]]]:
+    """
+    Load previously converted Notion blocks for a markdown source.
+
+    Args:
+        source: Raw bytes of the markdown file
+
+    Returns:
+        list: Cached Notion blocks, or None if there is no usable cache entry
+    """
+    cache_file = _cache_file(source)
+    if not cache_file.exists():
+        return None
+
+    try:
+        with cache_file.open("r", encoding="utf-8") as f:
+            blocks = json.load(f)
+        logger.debug(f"Loaded {len(blocks)} cached blocks from {cache_file}")
+        return blocks
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache file {cache_file}: {e}")
+        return None
+
+
+def store_cached_blocks(source: bytes, blocks: List[Dict[str, Any]]) -> None:
+    """
+    Cache converted Notion blocks for a markdown source.
+
+    Args:
+        source: Raw bytes of the markdown file
+        blocks: Notion blocks converted from the source
+    """
+    cache_file = _cache_file(source)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with temp_file.open("w", encoding="utf-8") as f:
+            json.dump(blocks, f, ensure_ascii=False)
+        temp_file.replace(cache_file)
+        logger.debug(f"Cached {len(blocks)} blocks in {cache_file}")
+    except OSError as e:
+        logger.warning(f"Failed to write cache file {cache_file}: {e}")
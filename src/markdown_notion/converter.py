@@ -1,10 +1,52 @@
 """Module for converting between markdown and Notion block structures."""
 
 import re
-from typing import Any, Dict, List
+import sys
+from typing import Any, Dict, Iterable, Iterator, List
 
 from loguru import logger
 
+# One character of inline content, taking a backslash escape as a single
+# character so an escaped delimiter never closes a pattern
+_CHAR = r"(?:\\.|[^\\\n])"
+
+# Inline markdown patterns in match priority order. A backslash escape comes
+# first so its character is never read as the start of another pattern.
+# Single-character delimiters use a possessive class of characters other than
+# the delimiter, which matches the same text as a lazy ".+?" up to the next
+# delimiter but without a backtracking step per character. The link text is
+# atomic up to the first "](", so an unclosed URL fails in linear time instead
+# of retrying every later "](" in the line.
+_INLINE_PATTERNS = (
+    ("escape", r"\\[\\*_~`\[\]()^$=]"),  # \*
+    ("bold_italic", rf"\*\*\*({_CHAR}+?)\*\*\*|___({_CHAR}+?)___"),  # ***text***
+    ("bold", rf"\*\*({_CHAR}+?)\*\*|__({_CHAR}+?)__"),  # **text** or __text__
+    (
+        "italic",
+        rf"\*({_CHAR}(?:\\.|[^*\\\n])*+)\*|_({_CHAR}(?:\\.|[^_\\\n])*+)_",
+    ),  # *text* or _text_
+    ("strikethrough", rf"~~({_CHAR}+?)~~"),  # ~~text~~
+    ("code", r"`(.[^`\n]*+)`"),  # `code`
+    ("link", rf"\[(?>({_CHAR}+?)\]\()(.[^)\n]*+)\)"),  # [text](url)
+    ("superscript", rf"\^({_CHAR}(?:\\.|[^^\\\n])*+)\^"),  # ^text^
+    ("subscript", rf"~({_CHAR}(?:\\.|[^~\\\n])*+)~"),  # ~text~
+    ("math_block", rf"\$\$({_CHAR}+?)\$\$"),  # $$block math$$
+    ("math_inline", rf"\$({_CHAR}(?:\\.|[^$\\\n])*+)\$"),  # $inline math$
+    ("highlight", rf"==({_CHAR}+?)=="),  # ==text==
+)
+
+# All inline patterns fused into a single alternation with one named group each.
+# Alternatives are tried in the order above, which preserves their priority.
+_INLINE_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _INLINE_PATTERNS)
+)
+
+# Backslash escapes of the characters above, replaced by the character itself
+_ESCAPE_RE = re.compile(r"\\([\\*_~`\[\]()^$=])")
+
+# Characters that can start an inline pattern; text without any is plain
+_INLINE_MARKERS = frozenset("\\*_~`[^$=")
+
 
 def markdown_to_notion_blocks(markdown_content: dict) -> List[Dict[str, Any]]:
     """
@@ -17,166 +59,190 @@ def markdown_to_notion_blocks(markdown_content: dict) -> List[Dict[str, Any]]:
         list: List of Notion blocks
     """
     logger.info("Converting markdown content to Notion blocks")
-    logger.debug(f"Processing {len(markdown_content['blocks'])} markdown blocks")
+    logger.debug("Processing {} markdown blocks", len(markdown_content["blocks"]))
+
+    blocks = list(iter_notion_blocks(markdown_content["blocks"]))
+
+    logger.info(f"Successfully converted {len(blocks)} Notion blocks")
+    return blocks
 
-    blocks = []
 
-    for block in markdown_content["blocks"]:
+def iter_notion_blocks(
+    markdown_blocks: Iterable[Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Convert parsed markdown blocks to Notion blocks one at a time.
+
+    Args:
+        markdown_blocks: Parsed markdown blocks, as in the "blocks" list
+            returned by the parser
+
+    Yields:
+        dict: Notion blocks in document order
+    """
+    for block in markdown_blocks:
         block_type = block["type"]
-        logger.trace(f"Converting block of type: {block_type}")
-
-        try:
-            if block_type.startswith("heading_"):
-                level = int(block_type[-1])
-                logger.debug(f"Processing heading level {level}")
-                blocks.append(
-                    {
-                        "type": "heading_" + str(level),
-                        "heading_" + str(level): {
-                            "rich_text": text_to_notion_rich_text(block["content"]),
-                            "color": "default",
-                            "is_toggleable": False,
-                        },
-                    }
-                )
-
-            elif block_type == "paragraph":
-                blocks.append(
-                    {
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": text_to_notion_rich_text(block["content"]),
-                            "color": "default",
-                        },
-                    }
-                )
-
-            elif block_type in ["bulleted_list", "numbered_list"]:
-                notion_type = (
-                    "bulleted_list_item"
-                    if block_type == "bulleted_list"
-                    else "numbered_list_item"
-                )
-                logger.debug(f"Processing {block_type} with type {notion_type}")
-
-                for item in block["items"]:
-                    blocks.append(
-                        {
-                            "type": notion_type,
-                            notion_type: {
-                                "rich_text": text_to_notion_rich_text(item["content"]),
-                                "color": "default",
-                                "children": _convert_nested_list_items(
-                                    item.get("children", []), notion_type
-                                ),
-                            },
-                        }
-                    )
-
-            elif block_type == "code":
-                logger.debug(
-                    f"Processing code block with language: {block.get('language', 'plain text')}"
-                )
-                blocks.append(
-                    {
-                        "type": "code",
-                        "code": {
-                            "rich_text": text_to_notion_rich_text(block["content"]),
-                            "language": block.get("language", "plain text"),
-                        },
-                    }
-                )
-
-            elif block_type == "quote":
-                blocks.append(
-                    {
-                        "type": "quote",
-                        "quote": {
-                            "rich_text": text_to_notion_rich_text(block["content"]),
-                            "color": "default",
-                        },
-                    }
-                )
-
-            elif block_type == "image":
-                logger.debug(f"Processing image with URL: {block['url']}")
-                blocks.append(
-                    {
-                        "type": "image",
-                        "image": {
-                            "type": "external",
-                            "external": {"url": block["url"]},
-                            "caption": text_to_notion_rich_text(
-                                block.get("caption", "")
-                            ),
-                        },
-                    }
-                )
-
-            elif block_type == "table":
-                rows = block["rows"]
-                has_header = block.get("has_header", True)
-                logger.debug(
-                    f"Processing table with {len(rows)} rows, has_header: {has_header}"
-                )
-
-                table_block = {
-                    "type": "table",
-                    "table": {
-                        "table_width": len(rows[0]) if rows else 0,
-                        "has_column_header": has_header,
-                        "has_row_header": False,
-                        "children": [],
-                    },
+        handler = _BLOCK_HANDLERS.get(block_type)
+        if handler is None:
+            continue
+        if block_type in _LIST_BLOCK_TYPES:
+            yield from handler(block)
+        else:
+            yield handler(block)
+
+
+def _heading_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a heading block to a Notion heading of the same level."""
+    # Parsed heading types (heading_1 to heading_6) match Notion's block types.
+    # The parser builds them at runtime, so intern them to share one copy.
+    heading_type = sys.intern(block["type"])
+    return {
+        "type": heading_type,
+        heading_type: {
+            "rich_text": text_to_notion_rich_text(block["content"]),
+            "color": "default",
+            "is_toggleable": False,
+        },
+    }
+
+
+def _paragraph_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a paragraph block to a Notion paragraph."""
+    return {
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": text_to_notion_rich_text(block["content"]),
+            "color": "default",
+        },
+    }
+
+
+def _list_item_blocks(block: Dict[str, Any], notion_type: str) -> List[Dict[str, Any]]:
+    """Convert a list block to one Notion list item block per top-level item."""
+    return [
+        {
+            "type": notion_type,
+            notion_type: {
+                "rich_text": text_to_notion_rich_text(item["content"]),
+                "color": "default",
+                "children": _convert_nested_list_items(
+                    item.get("children", []), notion_type
+                ),
+            },
+        }
+        for item in block["items"]
+    ]
+
+
+def _code_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a code block to a Notion code block of its literal text."""
+    content = block["content"]
+    return {
+        "type": "code",
+        "code": {
+            "rich_text": [_plain_text(content)] if content else [],
+            "language": sys.intern(block.get("language", "plain text")),
+        },
+    }
+
+
+def _quote_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a quote block to a Notion quote."""
+    return {
+        "type": "quote",
+        "quote": {
+            "rich_text": text_to_notion_rich_text(block["content"]),
+            "color": "default",
+        },
+    }
+
+
+def _image_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an image block to a Notion image with an external URL."""
+    return {
+        "type": "image",
+        "image": {
+            "type": "external",
+            "external": {"url": block["url"]},
+            "caption": text_to_notion_rich_text(block.get("caption", "")),
+        },
+    }
+
+
+def _table_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a table block to a Notion table with its rows as children."""
+    rows = block["rows"]
+    has_header = block.get("has_header", True)
+    logger.debug("Processing table with {} rows, has_header: {}", len(rows), has_header)
+
+    return {
+        "type": "table",
+        "table": {
+            "table_width": len(rows[0]) if rows else 0,
+            "has_column_header": has_header,
+            "has_row_header": False,
+            "children": [
+                {
+                    "type": "table_row",
+                    "table_row": {"cells": [_table_cell(cell) for cell in row]},
                 }
+                for row in rows
+            ],
+        },
+    }
 
-                for row in rows:
-                    table_block["table"]["children"].append(
-                        {
-                            "type": "table_row",
-                            "table_row": {
-                                "cells": [
-                                    [{"type": "text", "text": {"content": cell}}]
-                                    for cell in row
-                                ]
-                            },
-                        }
-                    )
 
-                blocks.append(table_block)
+def _table_cell(cell: str) -> List[Dict[str, Any]]:
+    """Convert a table cell to its plain rich text array."""
+    return [{"type": "text", "text": {"content": cell}}]
 
-            elif block_type == "divider":
-                blocks.append({"type": "divider", "divider": {}})
 
-        except Exception as e:
-            logger.error(f"Error converting block type {block_type}: {e}")
-            raise
+# Block types whose handler returns a list of Notion blocks
+_LIST_BLOCK_TYPES = frozenset({"bulleted_list", "numbered_list"})
 
-    logger.info(f"Successfully converted {len(blocks)} Notion blocks")
-    return blocks
+# Notion block builders keyed by parsed block type. Block types without a
+# handler are skipped.
+_BLOCK_HANDLERS = {
+    **{f"heading_{level}": _heading_block for level in range(1, 7)},
+    "paragraph": _paragraph_block,
+    "bulleted_list": lambda block: _list_item_blocks(block, "bulleted_list_item"),
+    "numbered_list": lambda block: _list_item_blocks(block, "numbered_list_item"),
+    "code": _code_block,
+    "quote": _quote_block,
+    "image": _image_block,
+    "table": _table_block,
+    "divider": lambda block: {"type": "divider", "divider": {}},
+}
 
 
 def _convert_nested_list_items(items: List[Dict], parent_type: str) -> List[Dict]:
     """Convert nested list items to Notion blocks."""
-    logger.trace(f"Converting nested list items of type: {parent_type}")
     if not items:
         return []
 
-    nested_blocks = []
-    for item in items:
-        nested_blocks.append(
-            {
+    parent_type = sys.intern(parent_type)
+    nested_blocks = [None] * len(items)
+
+    # Walk the item tree with an explicit stack instead of recursing. Each entry
+    # pairs one level of source items with the pre-sized list their blocks go
+    # into; a block's children list is filled in once its level is popped.
+    stack = [(items, nested_blocks)]
+    while stack:
+        level_items, level_blocks = stack.pop()
+        for index, item in enumerate(level_items):
+            children = item.get("children") or []
+            child_blocks = [None] * len(children)
+            level_blocks[index] = {
                 "type": parent_type,
                 parent_type: {
                     "rich_text": text_to_notion_rich_text(item["content"]),
                     "color": "default",
-                    "children": _convert_nested_list_items(
-                        item.get("children", []), parent_type
-                    ),
+                    "children": child_blocks,
                 },
             }
-        )
-    logger.trace(f"Converted {len(nested_blocks)} nested items")
+            if children:
+                stack.append((children, child_blocks))
+
     return nested_blocks
 
 
@@ -190,131 +256,123 @@ def text_to_notion_rich_text(text: str) -> List[Dict[str, Any]]:
     Returns:
         list: Notion rich text array with appropriate annotations
     """
-    logger.trace("Converting text to Notion rich text")
-    logger.trace(f"Input text length: {len(text)} characters")
-
     if not text:
         return []
 
-    try:
-        rich_text_blocks = []
-        current_position = 0
-        text_length = len(text)
-
-        # Regular expressions for markdown patterns
-        patterns = {
-            "bold_italic": r"\*\*\*(.+?)\*\*\*|___(.+?)___",  # ***text*** or ___text___
-            "bold": r"\*\*(.+?)\*\*|__(.+?)__",  # **text** or __text__
-            "italic": r"\*(.+?)\*|_(.+?)_",  # *text* or _text_
-            "strikethrough": r"~~(.+?)~~",  # ~~text~~
-            "code": r"`(.+?)`",  # `code`
-            "link": r"\[(.+?)\]\((.+?)\)",  # [text](url)
-            "superscript": r"\^(.+?)\^",  # ^text^
-            "subscript": r"~(.+?)~",  # ~text~
-            "math_block": r"\$\$(.+?)\$\$",  # $$block math$$
-            "math_inline": r"\$(.+?)\$",  # $inline math$
-            "highlight": r"==(.+?)==",  # ==text==
-        }
+    if _INLINE_MARKERS.isdisjoint(text):
+        return [_plain_text(text)]
+
+    return list(_iter_rich_text(text)) or [_plain_text(text)]
+
+
+def _iter_rich_text(text: str) -> Iterator[Dict[str, Any]]:
+    """Yield the Notion rich text objects for markdown-formatted text."""
+    current_position = 0
+
+    for match in _INLINE_RE.finditer(text):
+        # An escaped character is plain text, so it stays in the current run
+        if match.lastgroup == "escape":
+            continue
+
+        # Yield any text before the pattern
+        if match.start() > current_position:
+            yield _plain_text(_unescape(text[current_position : match.start()]))
+
+        # Process the matched pattern. Its named group closes last, so
+        # lastindex is that group's index and its capture groups follow it.
+        yield _INLINE_HANDLERS[match.lastgroup](match, match.lastindex)
+        current_position = match.end()
+
+    # Yield remaining text
+    if current_position < len(text):
+        yield _plain_text(_unescape(text[current_position:]))
+
+
+def _unescape(content: str) -> str:
+    """Replace the backslash escapes in text with the characters they escape."""
+    return _ESCAPE_RE.sub(r"\1", content) if "\\" in content else content
+
+
+def _plain_text(content: str) -> Dict[str, Any]:
+    """Build a rich text object without annotations."""
+    return {"type": "text", "text": {"content": content}}
+
+
+# Annotations for each inline style. Notion defaults every annotation that is
+# left out to false or "default", so only the ones that differ are sent.
+_BOLD_ITALIC_ANNOTATIONS = {"bold": True, "italic": True}
+_BOLD_ANNOTATIONS = {"bold": True}
+_ITALIC_ANNOTATIONS = {"italic": True}
+_STRIKETHROUGH_ANNOTATIONS = {"strikethrough": True}
+_CODE_ANNOTATIONS = {"code": True}
+_HIGHLIGHT_ANNOTATIONS = {"color": "yellow_background"}
+
+
+def _annotated_text(content: str, annotations: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a rich text object with a copy of the given annotations."""
+    return {
+        "type": "text",
+        "text": {"content": content},
+        "annotations": annotations.copy(),
+    }
+
+
+def _link(link_text: str, url: str) -> Dict[str, Any]:
+    """Build a rich text object linking to a URL."""
+    return {"type": "text", "text": {"content": link_text, "link": {"url": url}}}
+
+
+def _equation(expression: str) -> Dict[str, Any]:
+    """Build an equation rich text object."""
+    return {"type": "equation", "equation": {"expression": expression}}
+
+
+# Digit translation tables for superscript and subscript text
+_SUPER_MAP = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+_SUB_MAP = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+
+
+def _superscript(content: str) -> Dict[str, Any]:
+    """Build a rich text object with digits rendered as superscript."""
+    return _plain_text(content.translate(_SUPER_MAP))
+
+
+def _subscript(content: str) -> Dict[str, Any]:
+    """Build a rich text object with digits rendered as subscript."""
+    return _plain_text(content.translate(_SUB_MAP))
+
+
+def _content(match: re.Match, index: int) -> str:
+    """Return the text captured by the pattern whose named group is at index."""
+    # Patterns with two delimiter styles (*text* or _text_) capture into
+    # whichever of their two groups matched
+    content = match[index + 1]
+    return _unescape(content if content is not None else match[index + 2])
+
 
-        while current_position < text_length:
-            # Find the next markdown pattern
-            next_match = None
-            next_pattern = None
-            next_start = text_length
-
-            for pattern_name, pattern in patterns.items():
-                match = re.search(pattern, text[current_position:])
-                if match and (current_position + match.start() < next_start):
-                    next_match = match
-                    next_pattern = pattern_name
-                    next_start = current_position + match.start()
-
-            if next_match and next_pattern:
-                # Add any text before the pattern
-                if next_start > current_position:
-                    rich_text_blocks.append(
-                        {
-                            "type": "text",
-                            "text": {"content": text[current_position:next_start]},
-                        }
-                    )
-                    logger.trace(
-                        f"Added plain text of length {next_start - current_position}"
-                    )
-
-                # Process the matched pattern
-                if next_pattern == "link":
-                    link_text, url = next_match.groups()
-                    logger.trace(f"Processing link: {link_text} -> {url}")
-                    rich_text_blocks.append(
-                        {
-                            "type": "text",
-                            "text": {"content": link_text, "link": {"url": url}},
-                        }
-                    )
-                elif next_pattern in ["math_block", "math_inline"]:
-                    math_content = next_match.group(1)
-                    logger.trace(f"Processing math content of type: {next_pattern}")
-                    rich_text_blocks.append(
-                        {"type": "equation", "equation": {"expression": math_content}}
-                    )
-                else:
-                    content = next(
-                        group for group in next_match.groups() if group is not None
-                    )
-                    logger.trace(f"Processing {next_pattern} content")
-                    block = {
-                        "type": "text",
-                        "text": {"content": content},
-                        "annotations": {
-                            "bold": False,
-                            "italic": False,
-                            "strikethrough": False,
-                            "underline": False,
-                            "code": False,
-                            "color": "default",
-                        },
-                    }
-
-                    if next_pattern == "bold_italic":
-                        block["annotations"]["bold"] = True
-                        block["annotations"]["italic"] = True
-                    elif next_pattern == "bold":
-                        block["annotations"]["bold"] = True
-                    elif next_pattern == "italic":
-                        block["annotations"]["italic"] = True
-                    elif next_pattern == "strikethrough":
-                        block["annotations"]["strikethrough"] = True
-                    elif next_pattern == "code":
-                        block["annotations"]["code"] = True
-                    elif next_pattern == "superscript":
-                        superscript_map = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
-                        block["text"]["content"] = content.translate(superscript_map)
-                    elif next_pattern == "subscript":
-                        subscript_map = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
-                        block["text"]["content"] = content.translate(subscript_map)
-                    elif next_pattern == "highlight":
-                        block["annotations"]["color"] = "yellow_background"
-
-                    rich_text_blocks.append(block)
-
-                current_position = current_position + next_match.end()
-            else:
-                # Add remaining text
-                remaining_text = text[current_position:]
-                if remaining_text:
-                    rich_text_blocks.append(
-                        {"type": "text", "text": {"content": remaining_text}}
-                    )
-                break
-
-        logger.trace(f"Created {len(rich_text_blocks)} rich text blocks")
-        return (
-            rich_text_blocks
-            if rich_text_blocks
-            else [{"type": "text", "text": {"content": text}}]
-        )
-
-    except Exception as e:
-        logger.error(f"Error converting text to rich text: {e}")
-        raise
+# Rich text builders keyed by inline pattern name, called with the match and
+# the index of the pattern's named group. Code spans keep their backslashes;
+# every other pattern's text has its escapes replaced.
+_INLINE_HANDLERS = {
+    "bold_italic": lambda match, index: _annotated_text(
+        _content(match, index), _BOLD_ITALIC_ANNOTATIONS
+    ),
+    "bold": lambda match, index: _annotated_text(
+        _content(match, index), _BOLD_ANNOTATIONS
+    ),
+    "italic": lambda match, index: _annotated_text(
+        _content(match, index), _ITALIC_ANNOTATIONS
+    ),
+    "strikethrough": lambda match, index: _annotated_text(
+        _unescape(match[index + 1]), _STRIKETHROUGH_ANNOTATIONS
+    ),
+    "code": lambda match, index: _annotated_text(match[index + 1], _CODE_ANNOTATIONS),
+    "link": lambda match, index: _link(_unescape(match[index + 1]), match[index + 2]),
+    "superscript": lambda match, index: _superscript(_unescape(match[index + 1])),
+    "subscript": lambda match, index: _subscript(_unescape(match[index + 1])),
+    "math_block": lambda match, index: _equation(_unescape(match[index + 1])),
+    "math_inline": lambda match, index: _equation(_unescape(match[index + 1])),
+    "highlight": lambda match, index: _annotated_text(
+        _unescape(match[index + 1]), _HIGHLIGHT_ANNOTATIONS
+    ),
+}
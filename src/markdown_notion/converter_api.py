@@ -1,12 +1,28 @@
 """High-level API for converting markdown to Notion pages."""
 
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-from markdown_notion.converter import markdown_to_notion_blocks
+from loguru import logger
+
+from markdown_notion.cache import load_cached_blocks, store_cached_blocks
+from markdown_notion.converter import iter_notion_blocks, markdown_to_notion_blocks
 from markdown_notion.notion import NotionClient
-from markdown_notion.parser import parse_markdown_file
+from markdown_notion.parser import (
+    iter_markdown_file,
+    parse_markdown_file,
+    parse_markdown_text,
+)
 from markdown_notion.utils import validate_page_id
 
+# Upper bound on pages uploaded at once, matching Notion's average rate limit
+# of three requests per second per integration
+MAX_CONCURRENT_UPLOADS = 3
+
+# Separators in markdown filenames that become spaces in page titles
+_TITLE_TRANS = str.maketrans("-_", "  ")
+
 
 class MarkdownToNotion:
     """Main class for converting markdown to Notion pages."""
@@ -26,6 +42,7 @@ class MarkdownToNotion:
         *,
         clear: bool = False,
         update_title: bool = False,
+        use_cache: bool = False,
     ) -> bool:
         """Convert a markdown file to a Notion page.
 
@@ -34,6 +51,8 @@ class MarkdownToNotion:
             page_id: Notion page ID or URL where content will be added
             clear: Whether to clear existing page content before conversion
             update_title: Whether to update page title using markdown filename
+            use_cache: Whether to reuse blocks cached from an earlier conversion
+                of the same file content
 
         Returns:
             bool: True if successful, False otherwise
@@ -41,6 +60,7 @@ class MarkdownToNotion:
         Raises:
             ValueError: If page_id is invalid
             FileNotFoundError: If markdown file doesn't exist
+            UnicodeDecodeError: If markdown file is not valid UTF-8
         """
         # Validate and normalize page ID
         page_id = validate_page_id(page_id)
@@ -50,23 +70,71 @@ class MarkdownToNotion:
         if not markdown_path.exists():
             raise FileNotFoundError(f"Markdown file not found: {markdown_file}")
 
-        # Clear page content if requested
-        if clear and not self.notion.clear_page_content(page_id):
-            return False
+        # Parse markdown file and convert to Notion blocks. The file is read
+        # in full first, so an unreadable file fails before the page changes.
+        if use_cache:
+            notion_blocks = self._convert_cached(markdown_path)
+        else:
+            notion_blocks = iter_notion_blocks(iter_markdown_file(markdown_file))
 
-        # Update page title if requested
-        if update_title:
-            title = markdown_path.stem.replace("-", " ").replace("_", " ").title()
-            if not self.notion.update_page_title(page_id, title):
-                return False
-
-        # Parse markdown file and convert to Notion blocks
-        markdown_content = parse_markdown_file(markdown_file)
-        notion_blocks = markdown_to_notion_blocks(markdown_content)
+        # Clear page content and update page title if requested
+        if not self._prepare_page(page_id, markdown_path, clear, update_title):
+            return False
 
         # Append blocks to page
         return self.notion.append_blocks_to_page(page_id, notion_blocks)
 
+    def convert_files(
+        self,
+        jobs: List[Tuple[str, str]],
+        *,
+        clear: bool = False,
+        update_title: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> List[bool]:
+        """Convert several markdown files to Notion pages in parallel.
+
+        Files are parsed and converted in worker processes, and the resulting
+        blocks are uploaded from a small thread pool, so CPU-bound conversion
+        and network-bound uploads of different files overlap.
+
+        Args:
+            jobs: Pairs of markdown file path and Notion page ID or URL
+            clear: Whether to clear existing page content before conversion
+            update_title: Whether to update page titles using markdown filenames
+            max_workers: Number of conversion processes (default: CPU count)
+
+        Returns:
+            list: For each job, in order, True if successful, False otherwise
+
+        Raises:
+            ValueError: If any page_id is invalid
+            FileNotFoundError: If any markdown file doesn't exist
+        """
+        # Validate every job before starting any work
+        targets = []
+        for markdown_file, page_id in jobs:
+            markdown_path = Path(markdown_file)
+            if not markdown_path.exists():
+                raise FileNotFoundError(f"Markdown file not found: {markdown_file}")
+            targets.append((markdown_path, validate_page_id(page_id)))
+
+        logger.info(f"Converting {len(targets)} markdown files")
+        with ProcessPoolExecutor(max_workers=max_workers) as processes:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_UPLOADS) as threads:
+                uploads = [
+                    threads.submit(
+                        self._upload_converted,
+                        page_id,
+                        markdown_path,
+                        processes.submit(_parse_and_convert, str(markdown_path)),
+                        clear,
+                        update_title,
+                    )
+                    for markdown_path, page_id in targets
+                ]
+                return [upload.result() for upload in uploads]
+
     def convert_text(
         self, markdown_text: str, page_id: str, *, clear: bool = False
     ) -> bool:
@@ -90,8 +158,89 @@ class MarkdownToNotion:
         if clear and not self.notion.clear_page_content(page_id):
             return False
 
-        # Convert markdown to Notion blocks
-        notion_blocks = markdown_to_notion_blocks(markdown_text)
+        # Parse markdown text and convert to Notion blocks
+        markdown_content = parse_markdown_text(markdown_text)
+        notion_blocks = iter_notion_blocks(markdown_content["blocks"])
 
         # Append blocks to page
         return self.notion.append_blocks_to_page(page_id, notion_blocks)
+
+    def _prepare_page(
+        self, page_id: str, markdown_path: Path, clear: bool, update_title: bool
+    ) -> bool:
+        """Clear a page and set its title from the markdown filename, as requested.
+
+        Args:
+            page_id: Normalized Notion page ID
+            markdown_path: Path to the markdown file
+            clear: Whether to clear existing page content
+            update_title: Whether to update page title using markdown filename
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if clear and not self.notion.clear_page_content(page_id):
+            return False
+
+        if update_title:
+            title = markdown_path.stem.translate(_TITLE_TRANS).title()
+            if not self.notion.update_page_title(page_id, title):
+                return False
+
+        return True
+
+    def _upload_converted(
+        self,
+        page_id: str,
+        markdown_path: Path,
+        conversion: Future,
+        clear: bool,
+        update_title: bool,
+    ) -> bool:
+        """Upload the blocks of a file converted in a worker process.
+
+        Args:
+            page_id: Normalized Notion page ID
+            markdown_path: Path to the markdown file
+            conversion: Future resolving to the file's Notion blocks
+            clear: Whether to clear existing page content before uploading
+            update_title: Whether to update page title using markdown filename
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self._prepare_page(page_id, markdown_path, clear, update_title):
+            return False
+
+        try:
+            notion_blocks = conversion.result()
+        except Exception as e:
+            logger.error(f"Error converting {markdown_path}: {e}")
+            return False
+
+        return self.notion.append_blocks_to_page(page_id, notion_blocks)
+
+    def _convert_cached(self, markdown_path: Path) -> List[Dict[str, Any]]:
+        """Convert a markdown file, reusing cached blocks for unchanged content.
+
+        Args:
+            markdown_path: Path to the markdown file
+
+        Returns:
+            list: Notion blocks for the file
+        """
+        source = markdown_path.read_bytes()
+        notion_blocks = load_cached_blocks(source)
+        if notion_blocks is None:
+            markdown_content = parse_markdown_text(source.decode("utf-8"))
+            notion_blocks = markdown_to_notion_blocks(markdown_content)
+            store_cached_blocks(source, notion_blocks)
+        return notion_blocks
+
+
+def _parse_and_convert(markdown_file: str) -> List[Dict[str, Any]]:
+    """Parse a markdown file and convert it to Notion blocks.
+
+    Defined at module level so it can be run in a worker process.
+    """
+    return markdown_to_notion_blocks(parse_markdown_file(markdown_file))
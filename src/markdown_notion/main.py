@@ -36,6 +36,11 @@ def main():
         action="store_true",
         help="Update page title using markdown filename",
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse converted blocks cached from an earlier run on the same content",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -64,6 +69,7 @@ def main():
             args.page_id,
             clear=args.clear,
             update_title=args.update_title,
+            use_cache=args.cache,
         )
 
         if success:
@@ -1,14 +1,76 @@
 """Module for interacting with the Notion API."""
 
 import os
-from typing import Any, Dict, List
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List
 
+import httpx
 from dotenv import load_dotenv
 from loguru import logger
 from notion_client import Client
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
+# Maximum number of blocks the Notion API accepts in one append request
+MAX_BLOCKS_PER_REQUEST = 100
+
+# Average number of requests per second Notion allows for one integration
+REQUESTS_PER_SECOND = 3
+
+
+class RateLimiter:
+    """Thread-safe limiter allowing at most `rate` calls in any `period` seconds."""
+
+    def __init__(self, rate: int, period: float = 1.0):
+        """Initialize the limiter.
+
+        Args:
+            rate: Maximum number of calls per period
+            period: Length of the sliding window in seconds
+        """
+        self.rate = rate
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until another call can be made without exceeding the rate."""
+        with self._lock:
+            now = time.monotonic()
+            if len(self._calls) == self.rate:
+                delay = self._calls.popleft() + self.period - now
+                if delay > 0:
+                    time.sleep(delay)
+                    now += delay
+            self._calls.append(now)
+
+
+class OrjsonHTTPClient(httpx.Client):
+    """HTTP client that encodes JSON request bodies with orjson.
+
+    Block batches are large nested structures, and orjson serializes them
+    several times faster than the standard library encoder httpx uses.
+    """
+
+    def build_request(
+        self, method: str, url: Any, *, json: Any = None, **kwargs
+    ) -> httpx.Request:
+        if json is not None:
+            headers = httpx.Headers(kwargs.get("headers"))
+            headers["Content-Type"] = "application/json"
+            kwargs["headers"] = headers
+            kwargs["content"] = orjson.dumps(json)
+        return super().build_request(method, url, **kwargs)
+
 
 class NotionClient:
     def __init__(self):
@@ -20,47 +82,77 @@ class NotionClient:
 
         logger.info("Initializing Notion client")
         try:
-            self.client = Client(auth=self.token)
-            # Test the connection by getting the bot user
-            self.client.users.me
-            logger.info("Successfully connected to Notion API")
+            # Use orjson for request bodies when it is installed
+            http_client = OrjsonHTTPClient() if orjson else None
+            self.client = Client(auth=self.token, client=http_client)
+            self.rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+            logger.info("Successfully initialized Notion client")
         except Exception as e:
             logger.error(f"Failed to initialize Notion client: {e}")
             raise
 
-    def append_blocks_to_page(self, page_id: str, blocks: List[Dict[str, Any]]) -> bool:
+    def _request(self, endpoint: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call a Notion API endpoint once the rate limiter allows it.
+
+        The limiter is shared by every thread using this client, so parallel
+        uploads stay within Notion's request rate instead of hitting 429s.
+        """
+        self.rate_limiter.wait()
+        return endpoint(*args, **kwargs)
+
+    def append_blocks_to_page(
+        self, page_id: str, blocks: Iterable[Dict[str, Any]]
+    ) -> bool:
         """
         Append blocks to a Notion page.
 
+        Blocks are consumed in API-sized batches, so a lazy iterator keeps
+        producing the next batch while the previous one is being uploaded.
+
         Args:
             page_id: The ID of the Notion page
-            blocks: List of block objects to append
+            blocks: Block objects to append, such as a list or a generator
 
         Returns:
-            bool: True if successful, False otherwise
-        """
-        logger.info(f"Appending {len(blocks)} blocks to page {page_id}")
-
-        try:
-            # Verify page exists and is accessible
-            self.client.pages.retrieve(page_id)
-            logger.debug(f"Successfully verified access to page {page_id}")
+            bool: True if successful, False if a Notion request failed
 
-            # Notion API has a limit of 100 blocks per request
-            batch_size = 100
-            for i in range(0, len(blocks), batch_size):
-                batch = blocks[i : i + batch_size]
-                logger.debug(f"Processing batch of {len(batch)} blocks")
+        Raises:
+            Exception: Any error raised while iterating over blocks, after the
+                batches already sent have been uploaded
+        """
+        logger.info(f"Appending blocks to page {page_id}")
 
-                self.client.blocks.children.append(block_id=page_id, children=batch)
-                logger.debug(f"Successfully appended batch {i//batch_size + 1}")
+        blocks = iter(blocks)
+        appended = 0
 
-            logger.info("Successfully appended all blocks to page")
-            return True
+        # Batches go out one at a time: Notion appends each request to the
+        # end of the page, so concurrent appends could reorder the content
+        with ThreadPoolExecutor(max_workers=1) as uploader:
+            upload = None
+            try:
+                while batch := list(islice(blocks, MAX_BLOCKS_PER_REQUEST)):
+                    if upload and not _upload_succeeded(upload):
+                        return False
+                    upload = uploader.submit(
+                        self._request,
+                        self.client.blocks.children.append,
+                        block_id=page_id,
+                        children=batch,
+                    )
+                    appended += len(batch)
+            except Exception as e:
+                # Errors in producing the blocks are the caller's to handle,
+                # but the batches already sent stay on the page
+                logger.error(
+                    f"Error producing blocks after sending {appended} to page "
+                    f"{page_id}, which keeps them: {e}"
+                )
+                raise
+            if upload and not _upload_succeeded(upload):
+                return False
 
-        except Exception as e:
-            logger.error(f"Error appending blocks to page: {e}")
-            return False
+        logger.info(f"Successfully appended {appended} blocks to page")
+        return True
 
     def clear_page_content(self, page_id: str) -> bool:
         """
@@ -75,23 +167,58 @@ class NotionClient:
         logger.info(f"Clearing content from page {page_id}")
 
         try:
-            # Get all blocks in the page
-            blocks = self.client.blocks.children.list(block_id=page_id)
+            block_ids = [block["id"] for block in self._list_children(page_id)]
 
-            # Delete each block
-            for block in blocks["results"]:
-                self.client.blocks.delete(block_id=block["id"])
-                logger.trace(f"Deleted block {block['id']}")
+            # Delete the blocks in parallel; the rate limiter paces the requests
+            with ThreadPoolExecutor(max_workers=REQUESTS_PER_SECOND) as executor:
+                deletions = [
+                    executor.submit(self._delete_block, block_id)
+                    for block_id in block_ids
+                ]
+                try:
+                    for deletion in deletions:
+                        deletion.result()
+                except Exception:
+                    executor.shutdown(cancel_futures=True)
+                    raise
 
-            logger.info(
-                f"Successfully cleared {len(blocks['results'])} blocks from page"
-            )
+            logger.info(f"Successfully cleared {len(block_ids)} blocks from page")
             return True
 
         except Exception as e:
             logger.error(f"Error clearing page content: {e}")
             return False
 
+    def _list_children(self, block_id: str) -> List[Dict[str, Any]]:
+        """
+        List every child block of a block, following pagination.
+
+        Args:
+            block_id: The ID of the parent block or page
+
+        Returns:
+            list: All child block objects, in order
+        """
+        children = []
+        cursor = None
+        while True:
+            kwargs = {"start_cursor": cursor} if cursor else {}
+            response = self._request(
+                self.client.blocks.children.list,
+                block_id=block_id,
+                page_size=MAX_BLOCKS_PER_REQUEST,
+                **kwargs,
+            )
+            children.extend(response["results"])
+            if not response.get("has_more"):
+                return children
+            cursor = response["next_cursor"]
+
+    def _delete_block(self, block_id: str) -> None:
+        """Delete a single block."""
+        self._request(self.client.blocks.delete, block_id=block_id)
+        logger.trace("Deleted block {}", block_id)
+
     def update_page_title(self, page_id: str, title: str) -> bool:
         """
         Update the title of a Notion page.
@@ -106,7 +233,8 @@ class NotionClient:
         logger.info(f"Updating title of page {page_id}")
 
         try:
-            self.client.pages.update(
+            self._request(
+                self.client.pages.update,
                 page_id=page_id,
                 properties={"title": {"title": [{"text": {"content": title}}]}},
             )
@@ -116,3 +244,13 @@ class NotionClient:
         except Exception as e:
             logger.error(f"Error updating page title: {e}")
             return False
+
+
+def _upload_succeeded(upload: Future) -> bool:
+    """Wait for a batch upload, logging its error if it failed."""
+    try:
+        upload.result()
+        return True
+    except Exception as e:
+        logger.error(f"Error appending blocks to page: {e}")
+        return False
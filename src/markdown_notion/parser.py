@@ -1,11 +1,30 @@
 """Module for parsing markdown files into an intermediate representation."""
 
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-import markdown
-from bs4 import BeautifulSoup
 from loguru import logger
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+from mdit_py_plugins.deflist import deflist_plugin
+
+# Markdown parser with tables and definition lists, configured once. Parsing
+# keeps its state per call, so the instance can be shared. Escaped characters
+# and entities stay separate "text_special" tokens, so they can be told apart
+# from text the parser left unformatted.
+_MD = MarkdownIt("commonmark").enable("table").use(deflist_plugin).disable("text_join")
+
+# The same parser without inline parsing, enough to find link references
+_BLOCK_MD = (
+    MarkdownIt("commonmark")
+    .enable("table")
+    .use(deflist_plugin)
+    .disable(["text_join", "inline"])
+)
+
+# Number of lines parse_markdown_stream buffers before parsing a chunk
+STREAM_CHUNK_LINES = 1000
 
 
 def parse_markdown_file(file_path: str) -> dict:
@@ -18,26 +37,159 @@ def parse_markdown_file(file_path: str) -> dict:
     Returns:
         dict: Structured representation of the markdown content
     """
+    return {"blocks": list(iter_markdown_file(file_path))}
+
+
+def iter_markdown_file(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Parse a markdown file block by block without reading it all into memory.
+
+    The whole file is read and decoded before this returns, so a file that is
+    not valid UTF-8 fails here rather than partway through its blocks. A link
+    reference definition applies to the whole document, including blocks
+    before it, so if the file may define one, that first read also collects
+    the definitions and the blocks match parsing the whole text.
+
+    Args:
+        file_path: Path to the markdown file
+
+    Returns:
+        iterator: Blocks of the intermediate representation in document order,
+            parsed as they are requested
+
+    Raises:
+        FileNotFoundError: If the markdown file doesn't exist
+        UnicodeDecodeError: If the markdown file is not valid UTF-8
+    """
     logger.info(f"Parsing markdown file: {file_path}")
     path = Path(file_path)
     if not path.exists():
         logger.error(f"Markdown file not found: {file_path}")
         raise FileNotFoundError(f"Markdown file not found: {file_path}")
 
+    try:
+        env: Dict[str, Any] = {}
+        with path.open("r", encoding="utf-8") as f:
+            # Every definition has "]:" right after its label
+            if any("]:" in line for line in f):
+                f.seek(0)
+                for _ in _iter_block_tokens(f, env, _BLOCK_MD):
+                    pass
+                logger.debug(
+                    "Collected {} link references", len(env.get("references", {}))
+                )
+    except Exception as e:
+        logger.error(f"Error reading markdown file: {e}")
+        raise
+
+    return _iter_file_blocks(path, env)
+
+
+def _iter_file_blocks(path: Path, env: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Parse a markdown file that has been read once, yielding its blocks."""
     try:
         with path.open("r", encoding="utf-8") as f:
-            content = f.read()
-            logger.debug(f"Successfully read {len(content)} characters from file")
-        return parse_markdown_text(content)
+            for tokens in _iter_block_tokens(f, env, _MD):
+                yield from _process_tokens(tokens)
     except Exception as e:
         logger.error(f"Error reading markdown file: {e}")
         raise
 
 
+def parse_markdown_stream(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Parse markdown lines incrementally into blocks.
+
+    Lines are buffered and parsed in chunks. Every top-level block before the
+    last one in a chunk is complete, because later lines can no longer change
+    it, so those blocks are yielded and only the last block's lines are kept
+    for the next chunk. The blocks are the same as parsing the whole text,
+    except that a link reference definition only applies to blocks after it,
+    rather than throughout the document. iter_markdown_file has no such
+    limit, as it can read the file twice.
+
+    Args:
+        lines: Markdown lines including their line endings, such as an open file
+
+    Yields:
+        dict: Blocks of the intermediate representation in document order
+    """
+    for tokens in _iter_block_tokens(lines, {}, _MD):
+        yield from _process_tokens(tokens)
+
+
+def _iter_block_tokens(
+    lines: Iterable[str], env: Dict[str, Any], md: MarkdownIt
+) -> Iterator[List[Token]]:
+    """
+    Parse markdown lines in chunks, yielding the tokens of complete blocks.
+
+    Args:
+        lines: Markdown lines including their line endings
+        env: Parser environment shared by all chunks, carrying link references
+            from one chunk to the next
+        md: Parser to tokenize the chunks with
+
+    Yields:
+        list: Tokens of consecutive top-level blocks in document order
+    """
+    lines = iter(lines)
+    buffer: List[str] = []
+    limit = STREAM_CHUNK_LINES
+    while True:
+        # Fill the chunk in one call rather than appending line by line
+        buffer.extend(islice(lines, limit - len(buffer)))
+        if len(buffer) < limit:
+            break
+
+        tokens, complete_lines = _complete_block_tokens(buffer, env, md)
+        yield tokens
+        del buffer[:complete_lines]
+        # Grow the chunk while one block spans most of it, so a very long
+        # block is not reparsed for every few lines added to it
+        limit = max(STREAM_CHUNK_LINES, 2 * len(buffer))
+
+    if buffer:
+        yield md.parse("".join(buffer), env)
+
+
+def _complete_block_tokens(
+    lines: List[str], env: Dict[str, Any], md: MarkdownIt
+) -> Tuple[List[Token], int]:
+    """
+    Parse buffered lines, keeping only the blocks that are already complete.
+
+    Returns:
+        tuple: The tokens of the complete blocks and the number of lines they
+            span
+    """
+    tokens = md.parse("".join(lines), env)
+    starts = [
+        position
+        for position, token in enumerate(tokens)
+        if token.level == 0 and token.nesting != -1
+    ]
+    # The last block may still grow, and a definition list can still take in
+    # the block after it as another term, so keep those for the next chunk
+    kept = len(starts) - 1
+    while kept > 0 and tokens[starts[kept - 1]].type == "dl_open":
+        kept -= 1
+    if kept <= 0:
+        return [], 0
+
+    cut = starts[kept]
+    return tokens[:cut], tokens[cut].map[0]
+
+
 def parse_markdown_text(text: str) -> dict:
     """
     Parse markdown text and return a structured representation.
 
+    Block text is rebuilt as inline markdown from the parsed inline tokens.
+    Entities are decoded, text that markdown leaves unformatted is
+    backslash-escaped, and formatting such as bold, links and math is left for
+    the converter to turn into Notion rich text.
+
     Args:
         text: Raw markdown text
 
@@ -48,39 +200,19 @@ def parse_markdown_text(text: str) -> dict:
     logger.info("Starting markdown text parsing")
     logger.debug(f"Input text length: {len(text)} characters")
 
-    # Initialize markdown parser with extensions
-    md = markdown.Markdown(
-        extensions=[
-            "fenced_code",
-            "tables",
-            "nl2br",  # Convert newlines to line breaks
-            "attr_list",  # Support for custom attributes
-            "def_list",  # Definition lists
-            "md_in_html",  # Parse markdown inside HTML
-        ]
-    )
-    logger.debug("Initialized markdown parser with extensions")
+    # Text of only blank lines has no blocks. Other Unicode whitespace, such
+    # as a non-breaking space, is paragraph content in markdown.
+    if not text.strip(" \t\r\n"):
+        logger.info("Markdown text is empty")
+        return {"blocks": []}
 
     try:
-        # Convert markdown to HTML
-        html = md.convert(text)
-        logger.debug(f"Converted markdown to HTML: {len(html)} characters")
-
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html, "html.parser")
-        logger.debug("Created BeautifulSoup parser")
+        # Tokenize markdown into a flat stream of block tokens
+        tokens = _MD.parse(text)
+        logger.debug(f"Tokenized markdown into {len(tokens)} tokens")
 
-        # Process the HTML into our intermediate structure
-        blocks = []
-
-        for element in soup.children:
-            if element.name is None:  # Skip empty text nodes
-                continue
-
-            block = _process_element(element)
-            if block:
-                blocks.append(block)
-                logger.trace(f"Processed block of type: {block['type']}")
+        # Process the tokens into our intermediate structure
+        blocks = _process_tokens(tokens)
 
         result = {"blocks": blocks}
         logger.info(f"Successfully parsed markdown into {len(blocks)} blocks")
@@ -91,115 +223,257 @@ def parse_markdown_text(text: str) -> dict:
         raise
 
 
-def _process_element(element: BeautifulSoup) -> Optional[Dict[str, Any]]:
-    """Process a BeautifulSoup element into our intermediate structure."""
-    if element.name is None:
-        return None
+# Frame of an open container while walking tokens: its kind, the object it
+# fills in and, for containers with text content, the inline lines collected
+Frame = Tuple[str, Any, Optional[List[str]]]
 
-    logger.debug(f"Processing element of type: {element.name}")
+# Frame for unhandled top-level containers, whose contents are ignored
+_SKIP_FRAME: Frame = ("skip", None, None)
 
-    try:
-        # Handle horizontal rules first
-        if element.name == "hr":
-            logger.debug("Processing horizontal rule")
-            return {"type": "divider"}
-
-        # Handle headings
-        if element.name.startswith("h") and len(element.name) == 2:
-            level = element.name[1]
-            logger.debug(f"Processing heading with raw level: {level}")
-            try:
-                level = int(level)
-                return {"type": f"heading_{level}", "content": element.get_text()}
-            except ValueError:
-                logger.error(f"Invalid heading level: {level}")
-                raise
-
-        # Handle paragraphs
-        elif element.name == "p":
-            return {"type": "paragraph", "content": element.get_text()}
-
-        # Handle code blocks
-        elif element.name == "pre":
-            code_element = element.find("code")
-            language = (
-                code_element.get("class", [""])[0].replace("language-", "")
-                if code_element
-                else "plain text"
-            )
-            logger.debug(f"Processing code block with language: {language}")
-            return {
-                "type": "code",
-                "content": code_element.get_text()
-                if code_element
-                else element.get_text(),
-                "language": language,
-            }
-
-        # Handle lists
-        elif element.name in ["ul", "ol"]:
-            items = []
-            for li in element.find_all("li", recursive=False):
-                item = {"content": _get_list_item_text(li), "children": []}
-                # Process nested lists
-                nested_list = li.find(["ul", "ol"], recursive=False)
-                if nested_list:
-                    nested_items = _process_list(nested_list)
-                    item["children"].extend(nested_items)
-                items.append(item)
-
-            list_type = "bulleted_list" if element.name == "ul" else "numbered_list"
-            logger.debug(f"Processed {list_type} with {len(items)} items")
-            return {
-                "type": list_type,
-                "items": items,
-            }
-
-        # Handle blockquotes
-        elif element.name == "blockquote":
-            return {"type": "quote", "content": element.get_text()}
-
-        # Handle tables
-        elif element.name == "table":
-            rows = []
-            for tr in element.find_all("tr"):
-                row = [td.get_text().strip() for td in tr.find_all(["td", "th"])]
-                rows.append(row)
-
-            has_header = bool(element.find("th"))
-            logger.debug(
-                f"Processed table with {len(rows)} rows, has_header: {has_header}"
-            )
-            return {"type": "table", "rows": rows, "has_header": has_header}
-
-        logger.debug(f"Unhandled element type: {element.name}")
-        return None
+_LIST_OPEN_TYPES = ("bullet_list_open", "ordered_list_open")
 
-    except Exception as e:
-        logger.error(f"Error processing element {element.name}: {str(e)}")
-        raise
+# URL schemes of images Notion can embed as external files
+_EXTERNAL_URL_SCHEMES = ("http://", "https://")
+
+_CODE_TYPES = ("fence", "code_block")
+
+# Backslash escapes for literal text in inline markdown. Plain text children
+# are what CommonMark left unformatted, so its own markers are escaped while
+# the converter's extra syntax, such as ~~strikethrough~~ and $math$, still
+# applies. Escaped characters, entities, raw HTML and code outside a code span
+# are literal, so every marker the converter knows is escaped.
+_TEXT_ESCAPES = str.maketrans({char: f"\\{char}" for char in "\\*_`[]"})
+_LITERAL_ESCAPES = str.maketrans({char: f"\\{char}" for char in "\\*_~`[]()^$="})
 
+# Percent-encoded parentheses for URLs in inline markdown, where a ")" would
+# end the link early
+_URL_ESCAPES = str.maketrans({"(": "%28", ")": "%29"})
 
-def _process_list(list_element: BeautifulSoup) -> List[Dict[str, Any]]:
-    """Process a list element and its nested lists."""
-    logger.trace("Processing nested list")
-    items = []
-    for li in list_element.find_all("li", recursive=False):
-        item = {"content": _get_list_item_text(li), "children": []}
-        nested_list = li.find(["ul", "ol"], recursive=False)
-        if nested_list:
-            nested_items = _process_list(nested_list)
-            item["children"].extend(nested_items)
-        items.append(item)
-    logger.trace(f"Processed {len(items)} nested list items")
-    return items
-
-
-def _get_list_item_text(li: BeautifulSoup) -> str:
-    """Extract text content from a list item, excluding nested lists."""
-    # Clone the element to avoid modifying the original
-    li_copy = BeautifulSoup(str(li), "html.parser")
-    # Remove nested lists
-    for nested_list in li_copy.find_all(["ul", "ol"]):
-        nested_list.decompose()
-    return li_copy.get_text().strip()
+
+def _process_tokens(tokens: Sequence[Token]) -> List[Dict[str, Any]]:
+    """
+    Build our intermediate blocks from the token stream in a single pass.
+
+    Open containers are kept on an explicit stack rather than found by
+    rescanning the tokens, so nested lists cost no more than flat ones.
+    Tokens with no meaning of their own inside a container, such as the
+    paragraphs of a list item, reuse their parent's frame so the container
+    collects their text.
+    """
+    blocks = []
+    stack: List[Frame] = []
+
+    for token in tokens:
+        if token.nesting == -1:
+            frame = stack.pop()
+            if not stack or stack[-1] is not frame:
+                _close_frame(frame)
+        elif not stack:
+            block, frame = _open_block(token)
+            if block:
+                blocks.append(block)
+                logger.trace("Processed block of type: {}", block["type"])
+            if frame:
+                stack.append(frame)
+        elif token.nesting == 1:
+            stack.append(_open_nested(token, stack[-1]))
+        elif token.type == "inline":
+            _collect_inline(stack[-1], token)
+        elif token.type in _CODE_TYPES:
+            _collect_code(stack[-1], token)
+
+    return blocks
+
+
+def _open_block(token: Token) -> Tuple[Optional[Dict[str, Any]], Optional[Frame]]:
+    """
+    Start the top-level block for a token.
+
+    Returns:
+        tuple: The block (or None if unhandled) and, if the token opens a
+            container, the frame that collects its contents
+    """
+    logger.debug("Processing token of type: {}", token.type)
+
+    opener = _BLOCK_OPENERS.get(token.type)
+    if opener is None:
+        logger.debug("Unhandled token type: {}", token.type)
+        return None, _SKIP_FRAME if token.nesting == 1 else None
+    return opener(token)
+
+
+def _open_divider(token: Token) -> Tuple[Dict[str, Any], None]:
+    """Start a divider block for a horizontal rule."""
+    logger.debug("Processing horizontal rule")
+    return {"type": "divider"}, None
+
+
+def _open_heading(token: Token) -> Tuple[Dict[str, Any], Frame]:
+    """Start a heading block of the token's level."""
+    level = token.tag[1]
+    logger.debug("Processing heading with level: {}", level)
+    block = {"type": f"heading_{level}", "content": ""}
+    return block, ("text", block, [])
+
+
+def _open_paragraph(token: Token) -> Tuple[Dict[str, Any], Frame]:
+    """Start a paragraph block."""
+    block = {"type": "paragraph", "content": ""}
+    return block, ("text", block, [])
+
+
+def _open_code(token: Token) -> Tuple[Dict[str, Any], None]:
+    """Build a code block from a fenced or indented code token."""
+    language = token.info.split()[0] if token.info.strip() else "plain text"
+    logger.debug("Processing code block with language: {}", language)
+    return {"type": "code", "content": token.content, "language": language}, None
+
+
+def _open_list(token: Token) -> Tuple[Dict[str, Any], Frame]:
+    """Start a bulleted or numbered list block."""
+    list_type = "bulleted_list" if token.type == "bullet_list_open" else "numbered_list"
+    block = {"type": list_type, "items": []}
+    return block, ("list", block["items"], None)
+
+
+def _open_quote(token: Token) -> Tuple[Dict[str, Any], Frame]:
+    """Start a quote block."""
+    block = {"type": "quote", "content": ""}
+    return block, ("text", block, [])
+
+
+def _open_table(token: Token) -> Tuple[Dict[str, Any], Frame]:
+    """Start a table block."""
+    block = {"type": "table", "rows": [], "has_header": False}
+    return block, ("table", block, None)
+
+
+# Top-level token types mapped to the function starting their block
+_BLOCK_OPENERS = {
+    "hr": _open_divider,
+    "heading_open": _open_heading,
+    "paragraph_open": _open_paragraph,
+    "fence": _open_code,
+    "code_block": _open_code,
+    "bullet_list_open": _open_list,
+    "ordered_list_open": _open_list,
+    "blockquote_open": _open_quote,
+    "table_open": _open_table,
+}
+
+
+def _open_nested(token: Token, parent: Frame) -> Frame:
+    """Return the frame for a token opened inside the container of parent."""
+    kind, target, _ = parent
+
+    # Each list item collects its own text; nested lists become its children
+    if kind == "list" and token.type == "list_item_open":
+        item = {"content": "", "children": []}
+        target.append(item)
+        return "item", item, []
+    if kind == "item" and token.type in _LIST_OPEN_TYPES:
+        return "list", target["children"], None
+
+    # Table rows and cells fill in the table block
+    if kind == "table":
+        if token.type == "tr_open":
+            target["rows"].append([])
+        elif token.type == "th_open":
+            target["has_header"] = True
+
+    return parent
+
+
+def _collect_inline(frame: Frame, token: Token) -> None:
+    """Add an inline token's text to the container collecting it."""
+    kind, target, lines = frame
+    children = token.children
+    if (
+        kind == "text"
+        and target["type"] == "paragraph"
+        and len(children) == 1
+        and children[0].type == "image"
+        and children[0].attrs["src"].startswith(_EXTERNAL_URL_SCHEMES)
+    ):
+        # A paragraph of only an image becomes an image block. Notion can
+        # only embed images by URL, so a local image stays a link in text.
+        image = children[0]
+        del target["content"]
+        target["type"] = "image"
+        target["url"] = image.attrs.get("src", "")
+        target["caption"] = _inline_text(image).translate(_LITERAL_ESCAPES)
+    elif lines is not None:
+        lines.append(_inline_markdown(token))
+    elif kind == "table":
+        target["rows"][-1].append(_inline_text(token).strip())
+
+
+def _collect_code(frame: Frame, token: Token) -> None:
+    """Add the text of a code block nested in a list item or quote to it."""
+    _, _, lines = frame
+    if lines is not None:
+        lines.append(token.content.rstrip("\n").translate(_LITERAL_ESCAPES))
+
+
+def _close_frame(frame: Frame) -> None:
+    """Finish the container of a frame once its closing token is reached."""
+    kind, target, lines = frame
+    # Blocks start with empty content, and an image block has none
+    if lines:
+        target["content"] = "\n".join(lines)
+    elif kind == "table":
+        logger.debug(
+            "Processed table with {} rows, has_header: {}",
+            len(target["rows"]),
+            target["has_header"],
+        )
+
+
+def _inline_markdown(token: Token) -> str:
+    """
+    Rebuild the markdown of an inline token from its parsed children.
+
+    Text comes from the children, so entities are decoded and hard-break
+    markers are dropped. Characters the parser read as literal text are
+    backslash-escaped, so the converter does not format them. Emphasis, code
+    spans and links are written back as markdown for the converter to format,
+    and an image within text becomes a link to it.
+    """
+    parts = []
+    hrefs = []
+    for child in token.children or []:
+        child_type = child.type
+        if child_type == "text":
+            parts.append(child.content.translate(_TEXT_ESCAPES))
+        elif child_type == "text_special" or child_type == "html_inline":
+            parts.append(child.content.translate(_LITERAL_ESCAPES))
+        elif child_type == "softbreak" or child_type == "hardbreak":
+            parts.append("\n")
+        elif child_type == "code_inline":
+            parts.append(f"{child.markup}{child.content}{child.markup}")
+        elif child_type == "link_open":
+            hrefs.append(child.attrs.get("href", "").translate(_URL_ESCAPES))
+            parts.append("[")
+        elif child_type == "link_close":
+            parts.append(f"]({hrefs.pop()})")
+        elif child_type == "image":
+            # Notion has no inline images, so link to one within text, or
+            # keep only its description within a link
+            alt = _inline_text(child).translate(_LITERAL_ESCAPES)
+            src = child.attrs["src"].translate(_URL_ESCAPES)
+            parts.append(f"[{alt}]({src})" if not hrefs else alt)
+        else:
+            # Emphasis tokens carry the delimiter they were written with
+            parts.append(child.markup)
+    return "".join(parts)
+
+
+def _inline_text(token: Token) -> str:
+    """Extract the plain text of an inline token, dropping markdown formatting."""
+    return "".join(
+        [
+            child.content
+            for child in token.children or []
+            if child.type in ["text", "text_special", "code_inline"]
+        ]
+    )
@@ -1,27 +1,53 @@
 """Utility functions for markdown-notion converter."""
 
+import re
+
+# 32 hex digits, optionally in hyphenated UUID form
+_ID = r"[0-9a-f]{32}|[0-9a-f]{8}-(?:[0-9a-f]{4}-){3}[0-9a-f]{12}"
+
+# A bare page ID or a Notion URL whose path ends in one, followed by an
+# optional query string or fragment
+_PAGE_ID_RE = re.compile(
+    rf"https://\S*?[-/](?P<url_id>{_ID})(?P<query>[?#]\S*)?|(?P<id>{_ID})",
+    re.IGNORECASE,
+)
+
+# An ID given as a query parameter, such as the page in "?v=...&p=...&pm=s"
+_QUERY_ID_RE = re.compile(rf"[?&#](\w+)=({_ID})(?=[&#]|$)", re.IGNORECASE)
+
 
 def validate_page_id(page_id: str) -> str:
     """
     Validate and normalize the Notion page ID.
 
+    Accepted forms are a page ID (32 hex digits, with or without hyphens)
+    and an https URL whose last path segment ends in one, like
+    "https://www.notion.so/My-Page-<id>". The URL may carry a query string
+    or fragment. If the query names a page with "p=<id>", as in links to a
+    page opened in peek mode from a database, that page is used. Any other
+    ID in the query, such as a database view, makes the URL ambiguous, so
+    it is rejected.
+
     Args:
         page_id: Raw page ID or URL
 
     Returns:
         str: Normalized page ID
-    """
-    # Handle full URLs
-    if page_id.startswith("https://"):
-        # Extract ID from URL
-        parts = page_id.split("/")
-        page_id = parts[-1].split("-")[-1]
 
-    # Remove any hyphens
-    page_id = page_id.replace("-", "")
-
-    # Validate length
-    if len(page_id) != 32:
+    Raises:
+        ValueError: If no page ID can be found
+    """
+    match = _PAGE_ID_RE.fullmatch(page_id)
+    if not match:
         raise ValueError("Invalid Notion page ID format")
 
-    return page_id
+    result = match["url_id"] or match["id"]
+    if match["query"]:
+        query_ids = dict(_QUERY_ID_RE.findall(match["query"]))
+        if "p" in query_ids:
+            result = query_ids["p"]
+        elif query_ids:
+            raise ValueError("Notion URL does not identify a single page")
+
+    # Remove any hyphens
+    return result.replace("-", "")
@@ -0,0 +1,47 @@
+"""Tests for the on-disk cache of converted blocks."""
+
+import pytest
+
+from markdown_notion import cache
+from markdown_notion.cache import (
+    CACHE_VERSION,
+    get_cache_dir,
+    load_cached_blocks,
+    store_cached_blocks,
+)
+
+BLOCKS = [{"type": "divider", "divider": {}}]
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    """Keep cache files in a temporary directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+
+def test_miss_then_hit():
+    assert load_cached_blocks(b"---\n") is None
+    store_cached_blocks(b"---\n", BLOCKS)
+    assert load_cached_blocks(b"---\n") == BLOCKS
+    assert load_cached_blocks(b"***\n") is None
+
+
+def test_cache_file_is_named_by_version(monkeypatch):
+    store_cached_blocks(b"---\n", BLOCKS)
+    (cache_file,) = get_cache_dir().iterdir()
+    assert cache_file.name.startswith(f"v{CACHE_VERSION}-")
+
+    # Entries written by another version are not used
+    monkeypatch.setattr(cache, "CACHE_VERSION", CACHE_VERSION + 1)
+    assert load_cached_blocks(b"---\n") is None
+
+
+def test_corrupt_entry_is_ignored():
+    store_cached_blocks(b"---\n", BLOCKS)
+    (cache_file,) = get_cache_dir().iterdir()
+    cache_file.write_text('[{"type": ', encoding="utf-8")
+    assert load_cached_blocks(b"---\n") is None
+
+    # A new conversion replaces the entry
+    store_cached_blocks(b"---\n", BLOCKS)
+    assert load_cached_blocks(b"---\n") == BLOCKS
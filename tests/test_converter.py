@@ -0,0 +1,74 @@
+"""Tests for converting parsed markdown to Notion blocks."""
+
+import pytest
+
+from markdown_notion.converter import markdown_to_notion_blocks
+from markdown_notion.parser import parse_markdown_text
+
+
+def _rich_text(markdown):
+    """Convert a one-paragraph document and return its rich text."""
+    (block,) = markdown_to_notion_blocks(parse_markdown_text(markdown))
+    return block["paragraph"]["rich_text"]
+
+
+@pytest.mark.parametrize(
+    "markdown, text",
+    [
+        ("snake_case_var", "snake_case_var"),
+        ("snake\\_case\\_var", "snake_case_var"),
+        ("5 \\* 3 \\* 2", "5 * 3 * 2"),
+        ("\\[not a link\\](x)", "[not a link](x)"),
+        ("costs \\$5 or \\$6", "costs $5 or $6"),
+        ("C:\\\\dir\\\\*", "C:\\dir\\*"),
+    ],
+)
+def test_literal_text_is_not_formatted(markdown, text):
+    assert _rich_text(markdown) == [{"type": "text", "text": {"content": text}}]
+
+
+def test_escaped_delimiter_inside_formatting():
+    assert _rich_text("*a \\* b* `x\\*`") == [
+        {
+            "type": "text",
+            "text": {"content": "a * b"},
+            "annotations": {"italic": True},
+        },
+        {"type": "text", "text": {"content": " "}},
+        {"type": "text", "text": {"content": "x\\*"}, "annotations": {"code": True}},
+    ]
+
+
+def test_code_block_is_literal():
+    blocks = markdown_to_notion_blocks(parse_markdown_text("```\n**a** \\*\n```\n"))
+    assert blocks[0]["code"]["rich_text"] == [
+        {"type": "text", "text": {"content": "**a** \\*\n"}}
+    ]
+
+
+def test_image_becomes_external_image():
+    blocks = markdown_to_notion_blocks(parse_markdown_text("![A cat](https://i.png)"))
+    assert blocks == [
+        {
+            "type": "image",
+            "image": {
+                "type": "external",
+                "external": {"url": "https://i.png"},
+                "caption": [{"type": "text", "text": {"content": "A cat"}}],
+            },
+        }
+    ]
+
+
+def test_link_url_with_parentheses():
+    url = "https://en.wikipedia.org/wiki/Foo_(bar)"
+    assert _rich_text(f"[x]({url}) after") == [
+        {
+            "type": "text",
+            "text": {
+                "content": "x",
+                "link": {"url": "https://en.wikipedia.org/wiki/Foo_%28bar%29"},
+            },
+        },
+        {"type": "text", "text": {"content": " after"}},
+    ]
@@ -0,0 +1,21 @@
+"""Tests for the high-level conversion API."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from markdown_notion.converter_api import MarkdownToNotion
+
+PAGE_ID = "0123456789abcdef0123456789abcdef"
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_undecodable_file_fails_before_the_page_changes(tmp_path, use_cache):
+    path = tmp_path / "doc.md"
+    path.write_bytes(b"# Title\n\nok\n\n\xff\n")
+    notion = Mock()
+    with pytest.raises(UnicodeDecodeError):
+        MarkdownToNotion(notion).convert_file(
+            str(path), PAGE_ID, clear=True, use_cache=use_cache
+        )
+    assert notion.mock_calls == []
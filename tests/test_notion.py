@@ -0,0 +1,128 @@
+"""Tests for the Notion API client wrapper."""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from markdown_notion import notion as notion_module
+from markdown_notion.notion import REQUESTS_PER_SECOND, NotionClient, RateLimiter
+
+PAGE_ID = "0123456789abcdef0123456789abcdef"
+
+
+@pytest.fixture
+def notion(monkeypatch):
+    """A NotionClient whose API calls go to a mock, without rate limiting."""
+    monkeypatch.setenv("NOTION_TOKEN", "secret")
+    client = NotionClient()
+    client.client = Mock()
+    client.rate_limiter = RateLimiter(1000)
+    return client
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep, recording the sleeps."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_waits_for_the_sliding_window(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(notion_module.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(notion_module.time, "sleep", clock.sleep)
+    limiter = RateLimiter(3, period=1.0)
+
+    # The first three calls fit in the window
+    for offset in (0.0, 0.25, 0.5):
+        clock.now = 100.0 + offset
+        limiter.wait()
+    assert clock.sleeps == []
+
+    # The fourth waits until the first call leaves the window
+    limiter.wait()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+    # Once the window has moved past the second call, the next one is free
+    clock.now = 101.3
+    limiter.wait()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+    # The call after that waits for the third call, at 100.5, to expire
+    limiter.wait()
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.2)]
+
+
+def _paragraphs(count):
+    return [{"type": "paragraph", "paragraph": {"rich_text": []}}] * count
+
+
+def test_append_sends_batches_in_order(notion):
+    assert notion.append_blocks_to_page(PAGE_ID, iter(_paragraphs(250)))
+    append = notion.client.blocks.children.append
+    assert [len(call.kwargs["children"]) for call in append.call_args_list] == [
+        100,
+        100,
+        50,
+    ]
+
+
+def test_append_reports_a_failed_request(notion):
+    notion.client.blocks.children.append.side_effect = RuntimeError("400")
+    assert not notion.append_blocks_to_page(PAGE_ID, _paragraphs(250))
+    assert notion.client.blocks.children.append.call_count == 1
+
+
+def test_append_propagates_errors_from_the_blocks(notion):
+    def blocks():
+        yield from _paragraphs(150)
+        raise KeyError("content")
+
+    with pytest.raises(KeyError):
+        notion.append_blocks_to_page(PAGE_ID, blocks())
+    notion.client.blocks.children.append.assert_called_once()
+
+
+def test_list_children_follows_pagination(notion):
+    pages = {
+        None: {
+            "results": [{"id": "a"}, {"id": "b"}],
+            "has_more": True,
+            "next_cursor": "c1",
+        },
+        "c1": {"results": [{"id": "c"}], "has_more": True, "next_cursor": "c2"},
+        "c2": {"results": [{"id": "d"}], "has_more": False, "next_cursor": None},
+    }
+    notion.client.blocks.children.list.side_effect = lambda **kwargs: pages[
+        kwargs.get("start_cursor")
+    ]
+    assert [block["id"] for block in notion._list_children(PAGE_ID)] == list("abcd")
+    calls = notion.client.blocks.children.list.call_args_list
+    assert [call.kwargs.get("start_cursor") for call in calls] == [None, "c1", "c2"]
+
+
+def test_clear_page_content_stops_at_the_first_failed_delete(notion):
+    block_ids = [f"b{index}" for index in range(30)]
+    notion.client.blocks.children.list.return_value = {
+        "results": [{"id": block_id} for block_id in block_ids],
+        "has_more": False,
+    }
+
+    def delete(block_id):
+        if block_id == "b0":
+            raise RuntimeError("409")
+        time.sleep(0.02)
+
+    notion.client.blocks.delete.side_effect = delete
+    assert not notion.clear_page_content(PAGE_ID)
+    # Deletes already running finish, but the queued ones are cancelled
+    assert notion.client.blocks.delete.call_count <= 2 * REQUESTS_PER_SECOND
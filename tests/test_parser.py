@@ -0,0 +1,104 @@
+"""Tests for the markdown parser."""
+
+import pytest
+
+from markdown_notion import parser
+from markdown_notion.parser import (
+    parse_markdown_file,
+    parse_markdown_stream,
+    parse_markdown_text,
+)
+
+
+def test_code_block_in_list_item_is_kept():
+    markdown = "1. Install it:\n\n    ```bash\n    pip install foo\n    ```\n"
+    blocks = parse_markdown_text(markdown)["blocks"]
+    assert blocks == [
+        {
+            "type": "numbered_list",
+            "items": [{"content": "Install it:\npip install foo", "children": []}],
+        }
+    ]
+
+
+def test_code_block_in_quote_is_kept():
+    markdown = "> Note:\n>\n> ```\n> rm -rf x\n> ```\n"
+    blocks = parse_markdown_text(markdown)["blocks"]
+    assert blocks == [{"type": "quote", "content": "Note:\nrm -rf x"}]
+
+
+def test_literal_text_is_escaped_for_the_converter():
+    markdown = "AT&amp;T costs 5 \\* 3 &copy;\nline two\\\nsnake_case\\_var  \nend\n"
+    blocks = parse_markdown_text(markdown)["blocks"]
+    assert blocks == [
+        {
+            "type": "paragraph",
+            "content": "AT&T costs 5 \\* 3 ©\nline two\nsnake\\_case\\_var\nend",
+        }
+    ]
+
+
+def test_inline_formatting_is_kept_as_markdown():
+    markdown = "**b** *i* `c` [link](https://example.com)\n"
+    blocks = parse_markdown_text(markdown)["blocks"]
+    assert blocks == [{"type": "paragraph", "content": markdown.rstrip("\n")}]
+
+
+def test_image_paragraph_becomes_image_block():
+    blocks = parse_markdown_text("![A *cat*](https://i.png)\n")["blocks"]
+    assert blocks == [{"type": "image", "url": "https://i.png", "caption": "A cat"}]
+
+
+def test_image_within_text_becomes_link():
+    markdown = "See ![a](https://i.png) or [![b](https://j.png)](https://k)\n"
+    blocks = parse_markdown_text(markdown)["blocks"]
+    assert blocks == [
+        {"type": "paragraph", "content": "See [a](https://i.png) or [b](https://k)"}
+    ]
+
+
+def test_local_image_stays_in_text():
+    blocks = parse_markdown_text("![a](img/a.png)\n")["blocks"]
+    assert blocks == [{"type": "paragraph", "content": "[a](img/a.png)"}]
+
+
+def test_file_resolves_references_defined_later(tmp_path, monkeypatch):
+    monkeypatch.setattr(parser, "STREAM_CHUNK_LINES", 2)
+    markdown = "See [the docs].\n\nMore text.\n\nEven more.\n\n[the docs]: https://d\n"
+    path = tmp_path / "doc.md"
+    path.write_text(markdown, encoding="utf-8")
+    blocks = parse_markdown_text(markdown)["blocks"]
+    assert blocks[0] == {"type": "paragraph", "content": "See [the docs](https://d)."}
+    assert parse_markdown_file(str(path))["blocks"] == blocks
+
+
+STREAM_DOCUMENTS = {
+    "fence": "Intro\n\n```python\nx = 1\n\ny = 2\n```\n\nAfter\n",
+    "loose list": "- one\n\n- two\n\n  still two\n\n- three\n\nAfter\n",
+    "setext heading": "Title\nline two\n=====\n\nText\n---\n\nAfter\n",
+    "definition list": "Term\n\n: First\n\nOther\n\n: Second\n\nAfter\n",
+    "reference": "[a]: https://a\n\nSee [a]\n\nand [a]\n\n[b]: https://b\n",
+    "quote": "> one\n>\n> two\nlazy\n\nAfter\n",
+}
+
+
+@pytest.mark.parametrize("chunk_lines", [1, 2, 3, 5])
+@pytest.mark.parametrize("name", STREAM_DOCUMENTS)
+def test_stream_matches_text_across_chunk_boundaries(monkeypatch, name, chunk_lines):
+    monkeypatch.setattr(parser, "STREAM_CHUNK_LINES", chunk_lines)
+    markdown = STREAM_DOCUMENTS[name]
+    lines = markdown.splitlines(keepends=True)
+    assert list(parse_markdown_stream(lines)) == parse_markdown_text(markdown)["blocks"]
+
+
+@pytest.mark.parametrize("chunk_lines", [1, 2, 3, 5])
+@pytest.mark.parametrize("name", STREAM_DOCUMENTS)
+def test_file_matches_text_across_chunk_boundaries(
+    tmp_path, monkeypatch, name, chunk_lines
+):
+    monkeypatch.setattr(parser, "STREAM_CHUNK_LINES", chunk_lines)
+    # Referencing the last definition from the top only works for files
+    markdown = f"Top [b]\n\n{STREAM_DOCUMENTS[name]}\n[b]: https://b\n"
+    path = tmp_path / "doc.md"
+    path.write_text(markdown, encoding="utf-8")
+    assert parse_markdown_file(str(path)) == parse_markdown_text(markdown)
@@ -0,0 +1,36 @@
+"""Tests for utility functions."""
+
+import pytest
+
+from markdown_notion.utils import validate_page_id
+
+PAGE_ID = "0123456789abcdef0123456789abcdef"
+DATABASE_ID = "f" * 32
+VIEW_ID = "a" * 32
+
+
+@pytest.mark.parametrize(
+    "page_id",
+    [
+        PAGE_ID,
+        "01234567-89ab-cdef-0123-456789abcdef",
+        f"https://www.notion.so/My-Page-{PAGE_ID}",
+        f"https://www.notion.so/My-Page-{PAGE_ID}?pvs=4",
+        f"https://www.notion.so/ws/{DATABASE_ID}?v={VIEW_ID}&p={PAGE_ID}&pm=s",
+    ],
+)
+def test_validate_page_id_accepts_ids_and_urls(page_id):
+    assert validate_page_id(page_id) == PAGE_ID
+
+
+@pytest.mark.parametrize(
+    "page_id",
+    [
+        "not-an-id",
+        "x" * 32,
+        f"https://www.notion.so/ws/{DATABASE_ID}?v={VIEW_ID}",
+    ],
+)
+def test_validate_page_id_rejects_other_input(page_id):
+    with pytest.raises(ValueError):
+        validate_page_id(page_id)